@@ -2,10 +2,11 @@
 """
 递归扫描 root_dir 下所有 Sxxx_Gxx_Dxx_Bxx_Txx.csv，
 按 Gxx_Dxx_Bxx_Txx 分类复制到 root_dir/by_condition/，
-并逐个比对大小+MD5，保证复制完整可复现。
+并逐个比对大小+修改时间（--verify 时再比对 xxh3 哈希），保证复制完整可复现。
 """
 
-import os, hashlib, shutil, sys, argparse, pathlib, subprocess
+import os, re, shutil, sys, argparse, pathlib, subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from tqdm import tqdm
@@ -14,43 +15,84 @@ except ModuleNotFoundError:
     subprocess.run([sys.executable, "-m", "pip", "install", "--user", "tqdm"], check=True)
     from tqdm import tqdm
 
-def md5(p):
-    h = hashlib.md5()
-    with open(p, "rb") as f:
-        for chunk in iter(lambda: f.read(1 << 20), b""):
-            h.update(chunk)
-    return h.hexdigest()
+try:
+    import xxhash
+except ModuleNotFoundError:
+    sys.exit("缺少 xxhash（见 requirements.txt），请先安装：pip install -r requirements.txt")
+
+# 机械硬盘建议 --workers 4 以内；NVMe/网络存储 16-32 个线程才能填满队列
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+CSV_RE = re.compile(r"^S\d+_G\d+_D\d+_B\d+_T\d+\.csv$")
 
-def main(root):
+def walk_csvs(d, skip):
+    # 用 os.scandir 递归：DirEntry 直接带有文件类型，stat() 结果也会被缓存
+    with os.scandir(d) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                if e.path != skip:
+                    yield from walk_csvs(e.path, skip)
+            elif e.is_file() and CSV_RE.match(e.name):
+                yield e
+
+def fast_digest(p):
+    # xxh3 只用于校验完整性（非安全用途），比 MD5 快一个数量级
+    h = xxhash.xxh3_64()
+    with open(p, "rb", buffering=0) as f:
+        while (b := f.read(1 << 20)):
+            h.update(b)
+    return h.digest()
+
+def main(root, verify=False, workers=DEFAULT_WORKERS):
     root = pathlib.Path(root).resolve()
     out  = root / "by_condition"
     out.mkdir(exist_ok=True)
 
     # 收集源文件，排除 by_condition 自身
-    csvs = [p for p in root.rglob("S*_G*_D*_B*_T*.csv") if out not in p.parents]
+    csvs = list(walk_csvs(str(root), str(out)))
     if not csvs:
         print("未找到任何 CSV，目录是否正确？")
         return
 
     print(f"共发现 {len(csvs)} 个源文件，开始分类复制 …")
 
-    copied, repaired = 0, 0
-    for src in tqdm(csvs, unit="file"):
+    # 先算出全部 (源, 目标) 并一次性建好目标目录，避免线程间重复 mkdir
+    pairs = []
+    for src in csvs:
         fname = src.name                       # S001_G03_D01_B01_T01.csv
         cond  = fname.split("_", 1)[1][:-4]    # G03_D01_B01_T01
-        dst_dir = out / cond
+        pairs.append((src, out / cond / fname))
+    for dst_dir in {dst.parent for _, dst in pairs}:
         dst_dir.mkdir(parents=True, exist_ok=True)
-        dst = dst_dir / fname
 
-        need_copy = (
-            not dst.exists()
-            or src.stat().st_size != dst.stat().st_size
-            or md5(src) != md5(dst)
-        )
+    def sync(pair):
+        src, dst = pair
+        # copy2 会保留 mtime：大小不同必须复制；大小相同但源更新时
+        # （可能是中断的拷贝）才读全文件比对哈希；两者都一致视为已复制，
+        # 只有 --verify 时才仍然比对哈希
+        # 直接 stat 目标，不存在时捕获异常，省去单独的 exists() 调用
+        try:
+            d = dst.stat()
+        except FileNotFoundError:
+            need_copy = True
+        else:
+            s = src.stat()
+            if s.st_size != d.st_size:
+                need_copy = True
+            elif s.st_mtime_ns > d.st_mtime_ns or verify:
+                need_copy = fast_digest(src) != fast_digest(dst)
+                if not need_copy:
+                    shutil.copystat(src, dst)   # 内容一致，同步 mtime，下次不再哈希
+            else:
+                need_copy = False
         if need_copy:
             shutil.copy2(src, dst)
-            repaired += dst.exists()
-        copied += 1
+        return need_copy
+
+    # 复制是 I/O 密集型，用线程池让多个拷贝的系统调用重叠
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        flags = list(tqdm(ex.map(sync, pairs), total=len(pairs), unit="file"))
+    copied, repaired = len(pairs), sum(flags)
 
     print(f"\n已检查 {len(csvs)}，复制/修复 {copied} 个文件，其中修复 {repaired} 个。")
     print("全部分类目录位于：", out)
@@ -58,5 +100,9 @@ def main(root):
 if __name__ == "__main__":
     ap = argparse.ArgumentParser(description="分类复制并校验 CSV")
     ap.add_argument("root", help="根目录，例如 gait_young_full / gait_old_full")
+    ap.add_argument("--verify", action="store_true",
+                    help="大小与修改时间一致时仍用 xxh3 哈希逐个比对")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                    help=f"并行复制线程数（默认 {DEFAULT_WORKERS}）")
     args = ap.parse_args()
-    main(args.root)
+    main(args.root, verify=args.verify, workers=args.workers)
@@ -1,10 +1,27 @@
 #!/usr/bin/env python3
 import os, shutil, argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def classify(root_dir):
+# 机械硬盘建议 --workers 4 以内；NVMe/网络存储 16-32 个线程才能填满队列
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def place(src, dst, link=True):
+    # 硬链接只改一次目录项，不复制数据；跨文件系统等失败时退回 copy2
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except FileExistsError:
+            if os.path.samefile(src, dst):
+                return   # 上次运行已链接过
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+def classify(root_dir, workers=DEFAULT_WORKERS, link=True):
     out_base = os.path.join(root_dir, 'by_condition')
     os.makedirs(out_base, exist_ok=True)
-    count = 0
+    pairs = []
     for cur, _, files in os.walk(root_dir):
         for f in files:
             if not f.lower().endswith('.csv') or not f.startswith('S'):
@@ -15,8 +32,15 @@ def classify(root_dir):
             cond = parts[1][:-4]   # 去掉 Sxxx_ 前缀 & .csv 后缀
             src  = os.path.join(cur, f)
             dst_dir = os.path.join(out_base, cond)
-            os.makedirs(dst_dir, exist_ok=True)
-            shutil.copy2(src, os.path.join(dst_dir, f))
+            pairs.append((src, os.path.join(dst_dir, f)))
+
+    # 先一次性建好目标目录，再用线程池并行复制（I/O 密集型）
+    for dst_dir in {os.path.dirname(dst) for _, dst in pairs}:
+        os.makedirs(dst_dir, exist_ok=True)
+    count = 0
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for fut in as_completed([ex.submit(place, src, dst, link) for src, dst in pairs]):
+            fut.result()
             count += 1
             if count % 50 == 0:
                 print(f"Copied {count} files...")
@@ -27,5 +51,9 @@ def classify(root_dir):
 if __name__ == '__main__':
     p = argparse.ArgumentParser(description="按 Gxx_Dxx_Bxx_Txx 分类 CSV")
     p.add_argument('root', help="数据根目录，例如 gait_young_full")
+    p.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                   help=f"并行复制线程数（默认 {DEFAULT_WORKERS}）")
+    p.add_argument('--link', action=argparse.BooleanOptionalAction, default=True,
+                   help="同一文件系统内用硬链接代替复制（默认开启；--no-link 强制复制）")
     args = p.parse_args()
-    classify(os.path.abspath(args.root))
+    classify(os.path.abspath(args.root), workers=args.workers, link=args.link)
@@ -0,0 +1,67 @@
+"""
+entropy_io.py
+
+Loader for individual_entropies_extracted.csv shared by the trial-level analysis
+scripts. The CSV is converted once to a Parquet sibling (when pyarrow is
+installed), and later runs read that instead of re-parsing the text. Also holds
+the PLOT_DPI setting every plotting script saves its figures with.
+"""
+import os
+import warnings
+import importlib.util
+import pandas as pd
+
+
+# Only the columns the analyses use are loaded. Labels have a handful of distinct
+# values, so they are categoricals. The entropies stay float64: the models and
+# the printed means are reported to 6 decimals, which float32 does not hold.
+ENTROPY_DTYPES = {'group': 'category', 'subject': 'category', 'Day': 'category',
+                  'Block': 'category', 'Trial': 'category',
+                  'symb': 'float64', 'perm': 'float64'}
+ENTROPY_COLUMNS = list(ENTROPY_DTYPES)
+
+
+def load_entropy_df(path):
+    """Read the analysis columns of the extracted entropy CSV, via a Parquet cache next to it."""
+    if importlib.util.find_spec('pyarrow') is None:
+        return pd.read_csv(path, usecols=ENTROPY_COLUMNS, dtype=ENTROPY_DTYPES)
+    path_pq = os.path.splitext(path)[0] + '.parquet'
+    # the extraction script rewrites the CSV, so only trust a cache newer than it
+    if os.path.exists(path_pq) and os.path.getmtime(path_pq) > os.path.getmtime(path):
+        return pd.read_parquet(path_pq, columns=ENTROPY_COLUMNS)
+    df = pd.read_csv(path, engine='pyarrow', usecols=ENTROPY_COLUMNS, dtype=ENTROPY_DTYPES)
+    try:
+        df.to_parquet(path_pq, compression='snappy')
+    except OSError as e:
+        print(f"Could not write Parquet cache {path_pq}: {e}")
+    return df
+
+
+def label_number(labels):
+    """Numeric part of 'B01'/'T03'/'D02' style labels as int8.
+
+    On a categorical column the conversion runs once per category rather
+    than once per row.
+    """
+    return labels.map(lambda c: int(c[1:])).astype('int8')
+
+
+def plot_dpi(default=150):
+    """DPI for saved figures: PLOT_DPI env var, default if unset, 'publish' for 300.
+
+    An unusable value falls back to default with a warning rather than
+    raising, since the figures are saved after the models have been fitted.
+    """
+    dpi = os.environ.get('PLOT_DPI', '').strip()
+    if not dpi:
+        return default
+    if dpi == 'publish':
+        return 300
+    try:
+        value = int(dpi)
+    except ValueError:
+        value = 0
+    if value <= 0:
+        warnings.warn(f"PLOT_DPI={dpi!r} is not 'publish' or a positive integer; using {default}")
+        return default
+    return value
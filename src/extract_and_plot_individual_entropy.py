@@ -10,93 +10,138 @@ Outputs saved to ./figures/
 import re
 import os
 import glob
+import mmap
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy.stats import ranksums
+from entropy_io import plot_dpi
+
+
+# pyarrow's CSV reader is much faster when it is installed
+_CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+_LOG_COLUMNS = ('logfile', 'group', 'file', 'subject', 'condition', 'symb', 'perm')
+_SECTION_START = b'--- Individual Entropy Results ---'
+_SECTION_ENDS = (b'--- Group Average Entropy Results ---', b'--- Analysis Complete ---')
+_DBT_RE = re.compile(r'(D\d{2})_(B\d{2})_(T\d{2})')
+# strict numeric literal, so float() on a captured value can never fail;
+# like the old parser it accepts a bare fraction such as '.5'
+_NUM_RE = r'([-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)'
+# Applied with .match() to stripped lines that already passed a cheap
+# startswith() prefilter, so both patterns are implicitly anchored.
+_GROUP_RE = re.compile(r'Group:[ \t]*(\w+)')
+_FILE_RE = re.compile(r'File:[ \t]*([^,]+),.*?Symb:[ \t]*' + _NUM_RE +
+                      r'.*?Perm:[ \t]*' + _NUM_RE)
+
+
+def _read_section(path):
+    """Return the raw bytes of the Individual Entropy Results section (b'' if absent)."""
+    if os.path.getsize(path) == 0:
+        return b''
+    # search the memory-mapped file so pages before the section are never
+    # copied into Python objects
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = mm.find(_SECTION_START)
+        if start < 0:
+            return b''
+        start += len(_SECTION_START)
+        ends = [e for e in (mm.find(marker, start) for marker in _SECTION_ENDS) if e >= 0]
+        return mm[start:min(ends) if ends else len(mm)]
 
 
 def parse_log_file(path):
-    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-        text = f.read()
-    # locate the Individual Entropy Results section
-    m = re.search(r'--- Individual Entropy Results ---(.*?)(--- Group Average Entropy Results ---|--- Analysis Complete ---|$)', text, re.S)
-    if not m:
-        return []
-    block = m.group(1)
-
-    rows = []
-    # Find all Group: labels with their positions
-    group_labels = [(gm.start(), gm.group(1).strip()) for gm in re.finditer(r'Group:\s*(\w+)', block)]
-
-    # Find all File: lines with positions
-    for fm in re.finditer(r'^\s*File:\s*(.+)$', block, re.M):
-        line = fm.group(1).strip()
-        pos = fm.start()
-        # assign group by finding the nearest preceding Group label
-        assigned_group = None
-        prev_labels = [lbl for (p,lbl) in group_labels if p <= pos]
-        if prev_labels:
-            assigned_group = prev_labels[-1]
-        else:
-            assigned_group = None
-
-        parts = [p.strip() for p in line.split(',')]
-        if len(parts) < 3:
+    # column-wise accumulators; aggregate_logs builds the DataFrame from these
+    groups, files, subjects, conditions, symbs, perms = [], [], [], [], [], []
+    # Only lines inside the Individual Entropy Results section matter; each
+    # File: entry belongs to the most recent Group: label seen before it.
+    # Most lines are neither, and a substring test on the raw bytes rejects
+    # them before anything is decoded or regex-matched.
+    current_group = None
+    for raw in _read_section(path).split(b'\n'):
+        raw = raw.strip()
+        if raw.startswith(b'Group:'):
+            gm = _GROUP_RE.match(raw.decode('utf-8', 'ignore'))
+            if gm:
+                current_group = gm.group(1)
             continue
-        fname = parts[0]
-        # normalize whitespace on the line to avoid wrapped numbers
-        clean_line = re.sub(r'\s+', ' ', line)
-        num_re = r'([-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)'
-        symb_m = re.search(r'Symb:\s*' + num_re, clean_line)
-        perm_m = re.search(r'Perm:\s*' + num_re, clean_line)
-        if symb_m and perm_m:
-            try:
-                symb = float(symb_m.group(1))
-                perm = float(perm_m.group(1))
-            except Exception:
-                # fallback strip non-numeric
-                symb = float(re.sub(r'[^0-9.+\-eE]', '', symb_m.group(1)))
-                perm = float(re.sub(r'[^0-9.+\-eE]', '', perm_m.group(1)))
-            # try extract subject and condition from fname
-            subj = None
-            cond = None
-            if '_' in fname:
-                parts_fname = fname.split('_')
-                if parts_fname[0].upper().startswith('S'):
-                    subj = parts_fname[0]
-                    cond = '_'.join(parts_fname[1:])
-                else:
-                    subj = parts_fname[0]
-                    cond = '_'.join(parts_fname[1:])
-            rows.append({'logfile': os.path.basename(path), 'group': assigned_group, 'file': fname, 'subject': subj, 'condition': cond, 'symb': symb, 'perm': perm})
-    return rows
-
-
-def aggregate_logs(pattern='analysis_output.*.log'):
+        if not raw.startswith(b'File:') or b'Symb:' not in raw:
+            continue
+        line = raw.decode('utf-8', 'ignore')
+        fm = _FILE_RE.match(line)
+        if not fm:
+            continue
+        fname = fm.group(1).strip()
+        symb = float(fm.group(2))
+        perm = float(fm.group(3))
+        # try extract subject and condition from fname
+        subj = None
+        cond = None
+        if '_' in fname:
+            parts_fname = fname.split('_')
+            if parts_fname[0].upper().startswith('S'):
+                subj = parts_fname[0]
+                cond = '_'.join(parts_fname[1:])
+            else:
+                subj = parts_fname[0]
+                cond = '_'.join(parts_fname[1:])
+        groups.append(current_group)
+        files.append(fname)
+        subjects.append(subj)
+        conditions.append(cond)
+        symbs.append(symb)
+        perms.append(perm)
+    return {'logfile': [os.path.basename(path)] * len(files), 'group': groups, 'file': files,
+            'subject': subjects, 'condition': conditions, 'symb': symbs, 'perm': perms}
+
+
+def aggregate_logs(pattern='analysis_output.*.log', cache_csv=None):
     files = sorted(glob.glob(pattern))
-    allrows = []
-    for p in files:
-        rows = parse_log_file(p)
-        allrows.extend(rows)
-    df = pd.DataFrame(allrows)
+    # reuse a previously extracted CSV if no log has been touched since it was written
+    if files and cache_csv and os.path.exists(cache_csv):
+        latest = max(os.path.getmtime(p) for p in files)
+        if os.path.getmtime(cache_csv) > latest:
+            cached = pd.read_csv(cache_csv, engine=_CSV_ENGINE,
+                                 dtype={'group': 'category', 'Day': 'category',
+                                        'symb': np.float32, 'perm': np.float32})
+            # a deleted or renamed log leaves the mtimes alone, so also check
+            # that the CSV was extracted from exactly the current set of logs
+            if set(cached['logfile']) == {os.path.basename(p) for p in files}:
+                print(f'Logs unchanged since {cache_csv} was written; reusing it')
+                return cached
+            print(f'Log files differ from those in {cache_csv}; re-parsing')
+    # logs are independent and parsing is CPU-bound, so spread them over processes
+    columns = {c: [] for c in _LOG_COLUMNS}
+    with ProcessPoolExecutor() as ex:
+        for parsed in ex.map(parse_log_file, files, chunksize=4):
+            for c in _LOG_COLUMNS:
+                columns[c].extend(parsed[c])
+    columns['symb'] = np.asarray(columns['symb'], dtype=np.float32)
+    columns['perm'] = np.asarray(columns['perm'], dtype=np.float32)
+    df = pd.DataFrame(columns)
     if df.empty:
         print('No individual entropy entries found in logs')
         return df
 
     # derive Day/Block/Trial from condition if present (expect Dxx_Bxx_Txx inside)
-    def parse_condition(cond):
-        if not cond or not isinstance(cond, str):
-            return (None, None, None)
-        m = re.search(r'(D\d{2})_(B\d{2})_(T\d{2})', cond)
-        if m:
-            return m.group(1), m.group(2), m.group(3)
-        return (None, None, None)
-
-    df[['Day','Block','Trial']] = df['condition'].apply(lambda x: pd.Series(parse_condition(x)))
+    df[['Day','Block','Trial']] = df['condition'].str.extract(_DBT_RE)
+    # only a handful of distinct labels, so keep them as categoricals
+    df['group'] = df['group'].astype('category')
+    df['Day'] = df['Day'].astype('category')
     return df
 
 
+def _nan_padded(cells):
+    """Stack ragged 1-D arrays (None for empty) into one 2-D float array, padding with NaN."""
+    rows = [np.empty(0) if c is None else np.asarray(c, dtype=float) for c in cells]
+    out = np.full((len(rows), max((len(r) for r in rows), default=0)), np.nan)
+    for i, r in enumerate(rows):
+        out[i, :len(r)] = r
+    return out
+
+
 def plot_individual_distribution(df, outdir='figures'):
     os.makedirs(outdir, exist_ok=True)
     sns.set(style='whitegrid')
@@ -104,7 +149,7 @@ def plot_individual_distribution(df, outdir='figures'):
     # Overall symbolic entropy distribution: jittered points + box
     plt.figure(figsize=(8,6))
     ax = sns.boxplot(x='group', y='symb', data=df, showcaps=True, boxprops={'facecolor':'None'}, showfliers=False)
-    ax = sns.swarmplot(x='group', y='symb', data=df, color='.25', size=5)
+    ax = sns.stripplot(x='group', y='symb', data=df, color='.25', size=5, jitter=0.25)
     plt.ylabel('Symbolic Entropy (per-subject)')
     plt.xlabel('Group')
     # overall ranksum
@@ -117,13 +162,16 @@ def plot_individual_distribution(df, outdir='figures'):
         plt.title('Symbolic Entropy per subject')
     plt.tight_layout()
     out1 = os.path.join(outdir, 'individual_symb_entropy_overall.png')
-    plt.savefig(out1, dpi=150)
+    plt.savefig(out1, dpi=plot_dpi(), pil_kwargs={'optimize': True})
     plt.close()
 
-    # By day: swarm + box per group per day
+    # By day: jittered strip + box per group per day
     plt.figure(figsize=(10,6))
     # create a combined column Day_Group for easy plotting
-    df['Day_group'] = df['Day'].fillna('Unknown') + ' ' + df['group'].str.capitalize()
+    # capitalise on the categories rather than on every row
+    day_labels = df['Day'].cat.add_categories(['Unknown']).fillna('Unknown').astype(str)
+    group_labels = df['group'].cat.rename_categories(str.capitalize).astype(str)
+    df['Day_group'] = (day_labels + ' ' + group_labels).astype('category')
     order_days = sorted(df['Day'].dropna().unique())
     # build order: for each day, show old then young
     order = []
@@ -134,25 +182,33 @@ def plot_individual_distribution(df, outdir='figures'):
     if not order:
         order = sorted(df['Day_group'].unique())
 
-    ax = sns.boxplot(x='Day_group', y='symb', data=df, order=order, notch=True)
-    ax = sns.swarmplot(x='Day_group', y='symb', data=df, color='k', size=4, order=order)
+    # bootstrap=None keeps the notch CI on the Gaussian approximation even if
+    # a matplotlibrc sets boxplot.bootstrap, which would resample every box
+    ax = sns.boxplot(x='Day_group', y='symb', data=df, order=order, notch=True, bootstrap=None)
+    ax = sns.stripplot(x='Day_group', y='symb', data=df, color='k', size=4, jitter=0.25, order=order)
     plt.xticks(rotation=45, ha='right')
     plt.ylabel('Symbolic Entropy (per-subject)')
     plt.xlabel('Day and Group')
     plt.title('Symbolic Entropy per subject by Day and Group')
 
     # annotate per-day p-values centered between the two groups for that day
-    y_max = df['symb'].max()
-    y_min = df['symb'].min()
+    y_min, y_max = df['symb'].agg(['min', 'max'])
     y_range = y_max - y_min if y_max is not None and y_min is not None else 1
+    # rank-sum test for every day in one vectorised call: row i holds day i's
+    # values for each group, NaN-padded to a common width
+    per_day = {(d, g): vals.dropna().to_numpy()
+               for (d, g), vals in df.groupby(['Day', 'group'], observed=True)['symb']}
+    old_arr = _nan_padded([per_day.get((d, 'old')) for d in order_days])
+    young_arr = _nan_padded([per_day.get((d, 'young')) for d in order_days])
+    n_old = (~np.isnan(old_arr)).sum(axis=1)
+    n_young = (~np.isnan(young_arr)).sum(axis=1)
+    try:
+        stat, day_p = ranksums(old_arr, young_arr, axis=1, nan_policy='omit')
+    except Exception:
+        day_p = np.full(len(order_days), np.nan)
     for i,d in enumerate(order_days):
-        old_vals = df[(df['Day']==d)&(df['group']=='old')]['symb'].dropna()
-        young_vals = df[(df['Day']==d)&(df['group']=='young')]['symb'].dropna()
-        if len(old_vals)>0 and len(young_vals)>0:
-            try:
-                stat,p = ranksums(old_vals, young_vals)
-            except Exception:
-                p = None
+        if n_old[i]>0 and n_young[i]>0:
+            p = None if np.isnan(day_p[i]) else day_p[i]
             xpos = i*2 + 0.5
             txt = f'p={p:.3f}' if p is not None else 'n/a'
             plt.text(xpos, y_max + 0.07*y_range, txt, ha='center', fontsize=9, fontweight='bold')
@@ -161,7 +217,7 @@ def plot_individual_distribution(df, outdir='figures'):
 
     plt.tight_layout()
     out2 = os.path.join(outdir, 'individual_symb_entropy_by_day.png')
-    plt.savefig(out2, dpi=150)
+    plt.savefig(out2, dpi=plot_dpi(), pil_kwargs={'optimize': True})
     plt.close()
 
     # Also save CSV of extracted individuals
@@ -174,7 +230,7 @@ def main():
     # Look for log files in the logs/ directory
     import os
     log_pattern = 'logs/analysis_output.*.log' if os.path.exists('logs') else 'analysis_output.*.log'
-    df = aggregate_logs(log_pattern)
+    df = aggregate_logs(log_pattern, cache_csv=os.path.join('figures', 'individual_entropies_extracted.csv'))
     if df.empty:
         print('No data to plot. Exiting.')
         return
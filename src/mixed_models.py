@@ -0,0 +1,121 @@
+"""
+mixed_models.py
+
+Random-intercept (1 | subject) mixed models shared by the trial-level analysis
+scripts. The design matrices are built with patsy directly and handed to
+sm.MixedLM, and fitted results are pickled to disk, keyed on the exact design,
+so re-running a script on unchanged data loads the fit instead of repeating it.
+"""
+import os
+import pickle
+import hashlib
+import warnings
+import numpy as np
+import pandas as pd
+import statsmodels
+import statsmodels.api as sm
+from patsy import dmatrices
+from joblib import Parallel, delayed
+
+
+def subject_mixedlm(formula, data, group_col='subject'):
+    """MixedLM for formula with a random intercept per group_col level."""
+    y, X = dmatrices(formula, data, return_type='dataframe')
+    # rows patsy dropped for missing values are dropped from the groups too
+    groups, _ = pd.factorize(data[group_col].loc[y.index])
+    return sm.MixedLM(y, X, groups=groups)
+
+
+def fit_subject_mixedlm(formula, data, cache_dir, group_col='subject', **fit_kwargs):
+    """Fit subject_mixedlm(formula, data).fit(**fit_kwargs), memoized under cache_dir.
+
+    The cache key hashes the formula, the fit options, the statsmodels
+    version and the design arrays themselves, so any change to the data
+    or the model gives a fresh fit. Warnings raised by the fit (e.g.
+    ConvergenceWarning) are stored with it and raised again on a cache hit.
+    """
+    model = subject_mixedlm(formula, data, group_col)
+    # 'with-warnings' marks the (result, warnings) pickle layout
+    h = hashlib.sha256(repr((formula, sorted(fit_kwargs.items()),
+                             statsmodels.__version__, 'with-warnings')).encode())
+    for arr in (model.endog, model.exog, model.groups):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    cache_path = os.path.join(cache_dir, '.mixedlm_cache', h.hexdigest() + '.pkl')
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            result, fit_warnings = pickle.load(f)
+        for message, category in fit_warnings:
+            warnings.warn(message, category, stacklevel=2)
+        return result
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        result = model.fit(**fit_kwargs)
+    # the optimizer can repeat the same warning many times; keep each once
+    fit_warnings = list(dict.fromkeys((str(w.message), w.category) for w in caught))
+    for message, category in fit_warnings:
+        warnings.warn(message, category, stacklevel=2)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump((result, fit_warnings), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"Could not cache the fit in {cache_path}: {e}")
+    return result
+
+
+# optimizer tried when a bootstrap refit fails with the caller's fit options
+FALLBACK_METHOD = 'powell'
+
+
+def _refit_fe_params(formula, sample, group_col, fit_kwargs):
+    """Fixed-effect estimates of one bootstrap refit (None if the fit fails).
+
+    Resamples with duplicated subjects can make the gradient optimizers hit a
+    singular Hessian, so a failed fit is retried with FALLBACK_METHOD, which
+    does not use gradients.
+    """
+    model = subject_mixedlm(formula, sample, group_col)
+    attempts = [fit_kwargs]
+    if fit_kwargs.get('method') != FALLBACK_METHOD:
+        attempts.append({**fit_kwargs, 'method': FALLBACK_METHOD})
+    for kwargs in attempts:
+        try:
+            with warnings.catch_warnings():
+                # boundary/convergence warnings would repeat once per replicate
+                warnings.simplefilter('ignore')
+                return model.fit(**kwargs).fe_params
+        except Exception:
+            continue
+    return None
+
+
+def bootstrap_subject_mixedlm(formula, data, n_boot, group_col='subject', seed=0,
+                              n_jobs=-1, **fit_kwargs):
+    """Fixed effects of n_boot subject-level (cluster) bootstrap refits.
+
+    Each replicate draws whole subjects with replacement, so a subject's
+    trials stay together, and a subject drawn twice counts as two subjects.
+    Replicates are independent and are fitted in parallel worker processes.
+    Returns one row of fixed-effect estimates per successful refit, and
+    warns if any replicate could not be fitted.
+    """
+    rng = np.random.default_rng(seed)
+    rows_by_subject = list(data.groupby(group_col, observed=True, sort=False).indices.values())
+    sizes = np.array([len(r) for r in rows_by_subject])
+
+    def samples():
+        for _ in range(n_boot):
+            draw = rng.integers(len(rows_by_subject), size=len(rows_by_subject))
+            rows = np.concatenate([rows_by_subject[k] for k in draw])
+            cluster = np.repeat(np.arange(len(draw)), sizes[draw])
+            # fresh index: a subject drawn twice would otherwise repeat row labels
+            yield data.iloc[rows].reset_index(drop=True).assign(_boot_cluster=cluster)
+
+    fits = Parallel(n_jobs=n_jobs)(
+        delayed(_refit_fe_params)(formula, sample, '_boot_cluster', fit_kwargs)
+        for sample in samples())
+    n_failed = sum(f is None for f in fits)
+    if n_failed:
+        warnings.warn(f"{n_failed} of {n_boot} bootstrap refits failed "
+                      f"(also with method={FALLBACK_METHOD!r}) and were dropped")
+    return pd.DataFrame([f for f in fits if f is not None]).reset_index(drop=True)
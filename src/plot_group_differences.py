@@ -1,16 +1,22 @@
+import importlib.util
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy import stats
+from entropy_io import plot_dpi
 
 # Read the data
-df = pd.read_csv('figures/individual_entropies_extracted.csv')
+# pyarrow's CSV reader is much faster when it is installed
+csv_engine = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+df = pd.read_csv('figures/individual_entropies_extracted.csv', engine=csv_engine)
 
 # Pre-compute stats for annotations and later panels
-old_data = df[df['group']=='old']['symb']
-young_data = df[df['group']=='young']['symb']
-stat, p_value = stats.mannwhitneyu(old_data, young_data, alternative='greater')
+# Split once by group; every panel below reuses these arrays
+gb = df.groupby('group', observed=True)['symb']
+old_data = gb.get_group('old').to_numpy()
+young_data = gb.get_group('young').to_numpy()
+stat, p_value = stats.mannwhitneyu(old_data, young_data, alternative='greater', method='asymptotic')
 old_mean, young_mean = old_data.mean(), young_data.mean()
 old_sem, young_sem = stats.sem(old_data), stats.sem(young_data)
 cohens_d = (old_mean - young_mean) / np.sqrt((old_data.var(ddof=1) + young_data.var(ddof=1)) / 2)
@@ -27,8 +33,7 @@ plt.rcParams['axes.labelsize'] = 12
 # 1. Violin plot with individual points (black and white version)
 plt.subplot(221)
 # Use grayscale violin plots
-parts = plt.violinplot([df[df['group']=='old']['symb'].values, 
-                        df[df['group']=='young']['symb'].values],
+parts = plt.violinplot([old_data, young_data],
                        positions=[0, 1], showmeans=False, showmedians=False, showextrema=False)
 for pc in parts['bodies']:
     pc.set_facecolor('lightgray')
@@ -36,8 +41,7 @@ for pc in parts['bodies']:
     pc.set_alpha(0.7)
 
 # Add boxplot overlay
-bp = plt.boxplot([df[df['group']=='old']['symb'].values, 
-                  df[df['group']=='young']['symb'].values],
+bp = plt.boxplot([old_data, young_data],
                  positions=[0, 1], widths=0.15, patch_artist=True,
                  boxprops=dict(facecolor='white', edgecolor='black'),
                  medianprops=dict(color='black', linewidth=2),
@@ -45,8 +49,8 @@ bp = plt.boxplot([df[df['group']=='old']['symb'].values,
                  capprops=dict(color='black'))
 
 # Calculate median values (the widest part of the box)
-old_median_val = df[df['group']=='old']['symb'].median()
-young_median_val = df[df['group']=='young']['symb'].median()
+old_median_val = np.median(old_data)
+young_median_val = np.median(young_data)
 
 # Draw horizontal lines at median positions
 plt.axhline(y=old_median_val, color='darkgray', linewidth=2, linestyle='--', alpha=0.6, zorder=1)
@@ -74,9 +78,9 @@ ax.text(0.5, ymax - 0.02, f'Old > Young: p={p_value:.2e}, d={cohens_d:.3f}',
 
 # 2. Kernel Density Estimation plot
 plt.subplot(222)
-sns.kdeplot(data=df[df['group']=='old'], x='symb', label='Old', 
+sns.kdeplot(x=old_data, label='Old', 
             fill=True, alpha=0.5, color='red')
-sns.kdeplot(data=df[df['group']=='young'], x='symb', label='Young', 
+sns.kdeplot(x=young_data, label='Young', 
             fill=True, alpha=0.5, color='blue')
 plt.title('B. Density Distribution Comparison')
 plt.xlabel('Symbolic Entropy')
@@ -87,7 +91,7 @@ plt.legend()
 plt.subplot(223)
 bp = sns.boxplot(data=df, x='group', y='symb', showfliers=False)
 # Add individual points with jitter (smaller and lighter)
-sns.swarmplot(data=df, x='group', y='symb', color='black', alpha=0.35, size=2.5)
+sns.stripplot(data=df, x='group', y='symb', color='black', alpha=0.35, size=2.5, jitter=0.25)
 plt.title('C. Box Plot with Individual Points')
 plt.ylabel('Symbolic Entropy')
 
@@ -107,16 +111,18 @@ plt.text(0.5, 2.15, f"Cohen's d = {cohens_d:.3f}", ha='center')
 
 # Adjust layout and save
 plt.tight_layout()
-plt.savefig('figures/enhanced_group_comparison.png', dpi=300, bbox_inches='tight')
+# Draft resolution by default; PLOT_DPI=publish renders the 300 DPI version
+plt.savefig('figures/enhanced_group_comparison.png', dpi=plot_dpi(), bbox_inches='tight',
+            pil_kwargs={'optimize': True})
 plt.close()
 
 # Print summary statistics
 print("\nSummary Statistics:")
 print("Old Group:")
-print(f"Mean ± SD: {old_mean:.3f} ± {old_data.std():.3f}")
+print(f"Mean ± SD: {old_mean:.3f} ± {old_data.std(ddof=1):.3f}")
 print(f"N = {len(old_data)}")
 print("\nYoung Group:")
-print(f"Mean ± SD: {young_mean:.3f} ± {young_data.std():.3f}")
+print(f"Mean ± SD: {young_mean:.3f} ± {young_data.std(ddof=1):.3f}")
 print(f"N = {len(young_data)}")
 print(f"\nMann-Whitney U test p-value: {p_value:.4f}")
 print(f"Cohen's d: {cohens_d:.3f}")
\ No newline at end of file
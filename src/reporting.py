@@ -0,0 +1,43 @@
+"""
+reporting.py
+
+Text-report helpers shared by the trial-level analysis scripts: the banner,
+model description and fitted summary that open each results file.
+"""
+
+
+def summary_text(result):
+    """result.summary().as_text(), built once per fitted result.
+
+    The scripts print the summary and then write it to the results file;
+    the SimpleTable rendering behind it only needs to run once. The text is
+    kept on the result itself, so it is freed together with the result.
+    """
+    text = getattr(result, '_summary_text', None)
+    if text is None:
+        text = result._summary_text = result.summary().as_text()
+    return text
+
+
+def write_heading(f, heading, width):
+    """Write a heading line framed by '=' rules of the given width."""
+    f.write("=" * width + "\n")
+    f.write(heading + "\n")
+    f.write("=" * width + "\n")
+
+
+def write_mixedlm_report(f, result, formula, title, width=70, intro=''):
+    """Write the opening of a (1 | subject) mixed-model results file.
+
+    Covers the title banner, an optional intro paragraph, the model and
+    random-effects lines, the fitted summary and the INTERPRETATION heading;
+    the caller writes its own findings after that.
+    """
+    write_heading(f, title, width)
+    f.write("\n" + intro)
+    f.write(f"Model: {formula}\n")
+    f.write("Random effects: (1 | subject)\n\n")
+    f.write(summary_text(result))
+    f.write("\n\n")
+    write_heading(f, "INTERPRETATION:", width)
+    f.write("\n")
